@@ -365,18 +365,31 @@ def render_category_performance_chart(df) -> None:
     except Exception as e:
         st.error(f"Error rendering category performance chart: {str(e)}")
 
-def render_payment_analysis_charts(payment_data: pl.DataFrame) -> None:
+def render_payment_analysis_charts(payment_data: pl.DataFrame, kind: Optional[str] = None) -> None:
     """
     Render payment analysis charts.
     
     Args:
         payment_data: DataFrame with payment data
+        kind: "methods" or "installments" to render only that chart; any other
+            value (e.g. "revenue") renders both side by side
     """
     if payment_data is None or payment_data.is_empty():
         st.warning("No payment data available for charts")
         return
     
-    df = payment_data.to_pandas()
+    # Keep Arrow-backed columns instead of boxing strings into object dtype
+    df = payment_data.to_pandas(use_pyarrow_extension_array=True)
+    
+    if kind == "methods":
+        st.subheader("💳 Payment Methods")
+        render_payment_methods_chart(df)
+        return
+    
+    if kind == "installments":
+        st.subheader("📊 Installment Analysis")
+        render_installment_chart(df)
+        return
     
     col1, col2 = st.columns(2)
     
@@ -31,21 +31,19 @@ def render_data_table(data: pl.DataFrame, title: str = None,
     if title:
         st.subheader(title)
     
-    # Convert to pandas for display
-    df_display = data.to_pandas()
-    
     # Limit rows if specified
+    df_display = data
     max_display_rows = max_rows or UI_CONFIG.get("max_rows_display", 1000)
-    if len(df_display) > max_display_rows:
-        st.info(f"Showing first {max_display_rows} rows of {len(df_display)} total rows")
+    if df_display.height > max_display_rows:
+        st.info(f"Showing first {max_display_rows} rows of {df_display.height} total rows")
         df_display = df_display.head(max_display_rows)
     
     # Format numeric columns
-    df_display = format_numeric_columns(df_display)
+    df_display = round_numeric_columns(df_display)
     
-    # Display table
+    # Display table straight from Arrow buffers, no pandas conversion
     st.dataframe(
-        df_display,
+        df_display.to_arrow(),
         height=UI_CONFIG.get("table_height", 400),
         width='stretch'
     )
@@ -332,6 +330,24 @@ def format_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
         st.error(f"Error formatting columns: {str(e)}")
         return df
 
+def round_numeric_columns(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Round float columns for display, Polars counterpart of format_numeric_columns.
+    
+    Args:
+        df: DataFrame to format
+        
+    Returns:
+        Formatted DataFrame
+    """
+    percentage_markers = ('rate', 'percentage', 'pct')
+    
+    return df.with_columns([
+        pl.col(col).round(1 if any(marker in col.lower() for marker in percentage_markers) else 2)
+        for col, dtype in df.schema.items()
+        if dtype in (pl.Float32, pl.Float64)
+    ])
+
 def create_download_buttons(df: pd.DataFrame, filename: str, key_prefix: str = "") -> None:
     """
     Create download buttons for different formats.
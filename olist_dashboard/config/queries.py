@@ -3,6 +3,7 @@ SQL query templates for the Olist Dashboard application.
 Organized by functional areas and optimized for BigQuery.
 """
 
+from functools import lru_cache
 from typing import Dict, Any
 
 # Executive Summary Queries
@@ -384,17 +385,20 @@ PAYMENT_QUERIES: Dict[str, str] = {
     """
 }
 
-def get_query(category: str, query_name: str, **kwargs) -> str:
+@lru_cache(maxsize=None)
+def get_query_template(category: str, query_name: str) -> str:
     """
-    Get a formatted SQL query with parameter substitution.
+    Get a query template with table names bound, leaving only the date parameters.
+    
+    Templates are resolved once per process so each call only substitutes
+    the date range.
     
     Args:
         category: Query category (executive, delivery, satisfaction, product, payment)
         query_name: Specific query name within the category
-        **kwargs: Parameters for string formatting
         
     Returns:
-        Formatted SQL query string
+        Query template with {start_date} and {end_date} placeholders
     """
     query_maps = {
         "executive": EXECUTIVE_QUERIES,
@@ -411,10 +415,20 @@ def get_query(category: str, query_name: str, **kwargs) -> str:
     if query_name not in queries:
         raise ValueError(f"Unknown query name: {query_name} in category: {category}")
     
-    query_template = queries[query_name]
-    
-    # Add table names from settings if not provided
+    # Bind table names from settings, keep the date placeholders for later
     from .settings import TABLES
-    kwargs.update(TABLES)
+    return queries[query_name].format(start_date="{start_date}", end_date="{end_date}", **TABLES)
+
+def get_query(category: str, query_name: str, **kwargs) -> str:
+    """
+    Get a formatted SQL query with parameter substitution.
     
-    return query_template.format(**kwargs)
+    Args:
+        category: Query category (executive, delivery, satisfaction, product, payment)
+        query_name: Specific query name within the category
+        **kwargs: Parameters for string formatting
+        
+    Returns:
+        Formatted SQL query string
+    """
+    return get_query_template(category, query_name).format(**kwargs)
@@ -170,7 +170,7 @@ class DataProcessor:
                 ])
                 
                 # Calculate revenue share
-                total_revenue = category_analysis.select(pl.sum('total_revenue')).item()
+                total_revenue = category_analysis.get_column('total_revenue').sum()
                 if total_revenue and total_revenue > 0:
                     category_analysis = category_analysis.with_columns(
                         (pl.col('total_revenue') / total_revenue * 100).alias('revenue_share_pct')
@@ -4,7 +4,7 @@ Payment Insights page - Analysis of payment methods, installments, and financial
 
 import streamlit as st
 import polars as pl
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from ..components.metrics import render_kpi_cards, render_trend_metrics
 from ..components.charts import render_payment_analysis_charts
@@ -12,6 +12,7 @@ from ..components.tables import render_data_table, render_top_performers_table,
 from ..data.data_loader import get_data_loader
 from ..data.data_processor import get_data_processor
 from ..data.cache_manager import cache_details
+from ..utils import script_thread_pool
 
 def render_payment_insights_page(filters: Dict[str, Any]) -> None:
     """
@@ -32,11 +33,14 @@ def render_payment_insights_page(filters: Dict[str, Any]) -> None:
     start_date = date_range.get("start_date", "2023-01-01")
     end_date = date_range.get("end_date", "2023-12-31")
     
+    # Normalize the date range once so equivalent widget values share a cache entry
+    date_key = (str(start_date).strip()[:10], str(end_date).strip()[:10])
+    
     # Load payment data
     with st.spinner("Loading payment analysis data..."):
-        payment_methods = load_payment_methods_data(data_loader, start_date, end_date)
-        installment_analysis = load_installment_analysis_data(data_loader, start_date, end_date)
-        revenue_optimization = load_revenue_optimization_data(data_loader, start_date, end_date)
+        payment_methods, installment_analysis, revenue_optimization = load_payment_frames(
+            data_loader, date_key
+        )
     
     # Debug: Check if dataframes are loaded
     st.info(f"DEBUG: payment_methods loaded: {payment_methods is not None and not payment_methods.is_empty()}")
@@ -92,9 +96,14 @@ def render_payment_insights_page(filters: Dict[str, Any]) -> None:
     if payment_methods is not None and not payment_methods.is_empty():
         st.info(f"Payment methods columns: {list(payment_methods.columns)}")
     
+    # Aggregate payment totals once for the page
+    pm_stats = None
+    if payment_methods is not None and "total_value" in payment_methods.columns:
+        pm_stats = payment_methods.select([pl.sum("order_count"), pl.sum("total_value")]).row(0, named=True)
+    
     # Main payment metrics - call this AFTER fallback calculation
     st.subheader("💰 Payment Performance Overview")
-    render_payment_overview_kpis(payment_methods, installment_analysis)
+    render_payment_overview_kpis(payment_methods, installment_analysis, date_key, pm_stats)
     
     st.markdown("---")
     
@@ -107,70 +116,111 @@ def render_payment_insights_page(filters: Dict[str, Any]) -> None:
     ])
     
     with tab1:
-        render_payment_methods_tab(payment_methods)
+        render_payment_methods_tab(payment_methods, date_key, pm_stats)
     
     with tab2:
-        render_installment_analysis_tab(installment_analysis)
+        render_installment_analysis_tab(installment_analysis, date_key)
     
     with tab3:
         render_revenue_optimization_tab(revenue_optimization)
     
     with tab4:
-        render_advanced_analytics_tab(payment_methods, installment_analysis, revenue_optimization, filters)
+        render_advanced_analytics_tab(payment_methods, installment_analysis, revenue_optimization, filters, date_key, pm_stats)
+
+@cache_details()
+def load_payment_frames(_data_loader, date_key: Tuple[str, str]) -> Tuple[Optional[pl.DataFrame], ...]:
+    """Load payment methods, installment and revenue optimization data concurrently."""
+    start_date, end_date = date_key
+    queries = (
+        ("payment methods", _data_loader.get_payment_method_analysis),
+        ("installment analysis", _data_loader.get_installment_analysis),
+        ("revenue optimization", _data_loader.get_revenue_optimization),
+    )
+    
+    # The three BigQuery jobs are independent, so overlap their round-trips
+    with script_thread_pool(len(queries)) as executor:
+        futures = [executor.submit(fetch, start_date, end_date) for _, fetch in queries]
+    
+    frames = []
+    for (label, _), future in zip(queries, futures):
+        try:
+            frames.append(future.result())
+        except Exception as e:
+            st.error(f"Error loading {label} data: {str(e)}")
+            frames.append(None)
+    
+    return tuple(frames)
+
+@cache_details()
+def export_frame_csv(_data: pl.DataFrame, date_key: Tuple[str, str], frame_name: str) -> str:
+    """Serialize a page frame to CSV straight from Polars, cached per date range and frame."""
+    return _data.write_csv()
 
 @cache_details()
-def load_payment_methods_data(_data_loader, start_date: str, end_date: str) -> Optional[pl.DataFrame]:
-    """Load payment methods analysis data."""
-    try:
-        return _data_loader.get_payment_method_analysis(start_date, end_date)
-    except Exception as e:
-        st.error(f"Error loading payment methods data: {str(e)}")
-        return None
+def enhance_methods(_payment_methods: pl.DataFrame, date_key: Tuple[str, str],
+                    _pm_stats: Dict[str, Any]) -> pl.DataFrame:
+    """Add per-method average value and volume/value share columns, cached per date range."""
+    return _payment_methods.with_columns([
+        (pl.col("total_value") / pl.col("order_count")).alias("avg_transaction_value"),
+        (pl.col("order_count") / _pm_stats["order_count"] * 100).alias("volume_share_pct"),
+        (pl.col("total_value") / _pm_stats["total_value"] * 100).alias("value_share_pct")
+    ])
 
 @cache_details()
-def load_installment_analysis_data(_data_loader, start_date: str, end_date: str) -> Optional[pl.DataFrame]:
-    """Load installment analysis data."""
-    try:
-        return _data_loader.get_installment_analysis(start_date, end_date)
-    except Exception as e:
-        st.error(f"Error loading installment analysis data: {str(e)}")
-        return None
+def summarize_installments(_installment_analysis: pl.DataFrame, date_key: Tuple[str, str]) -> Dict[str, Any]:
+    """Split installment data into single-payment and multi-installment totals, cached per date range."""
+    single = pl.col("payment_installments") == 1
+    multi = pl.col("payment_installments") > 1
+    order_value = pl.col("total_value") / pl.col("order_count")
+    
+    return _installment_analysis.select([
+        single.sum().alias("single_rows"),
+        multi.sum().alias("multi_rows"),
+        pl.col("order_count").filter(single).sum().alias("single_orders"),
+        pl.col("order_count").filter(multi).sum().alias("multi_orders"),
+        order_value.filter(single).mean().alias("single_avg"),
+        order_value.filter(multi).mean().alias("multi_avg"),
+        pl.col("order_count").sum().alias("total_orders"),
+        pl.col("total_value").filter(multi).sum().alias("multi_value"),
+        pl.col("total_value").sum().alias("total_value")
+    ]).row(0, named=True)
 
 @cache_details()
-def load_revenue_optimization_data(_data_loader, start_date: str, end_date: str) -> Optional[pl.DataFrame]:
-    """Load revenue optimization data."""
-    try:
-        return _data_loader.get_revenue_optimization(start_date, end_date)
-    except Exception as e:
-        st.error(f"Error loading revenue optimization data: {str(e)}")
-        return None
+def get_payment_types(_payment_methods: pl.DataFrame, date_key: Tuple[str, str]) -> List[str]:
+    """Distinct payment types for the explorer filter, cached per date range."""
+    return _payment_methods.get_column("payment_type").unique().to_list()
 
-def render_payment_overview_kpis(payment_methods: pl.DataFrame, installment_analysis: pl.DataFrame) -> None:
-    """Render payment overview KPI cards."""
+def render_payment_overview_kpis(payment_methods: pl.DataFrame, installment_analysis: pl.DataFrame,
+                                 date_key: Tuple[str, str],
+                                 pm_stats: Optional[Dict[str, Any]] = None) -> None:
+    """Render payment overview KPI cards from the page-level payment totals."""
     if payment_methods is None or payment_methods.is_empty():
         st.warning("No payment methods data available for KPIs")
         return
     
     # Ensure total_value column exists
-    if "total_value" not in payment_methods.columns:
+    if pm_stats is None:
         st.error("total_value column is missing from payment methods data")
         return
     
     # Calculate aggregate payment metrics
-    total_transactions = payment_methods.select(pl.sum("order_count")).item()
-    total_value = payment_methods.select(pl.sum("total_value")).item()
-    avg_value = total_value / total_transactions if total_transactions > 0 else 0
+    total_transactions = pm_stats["order_count"]
+    if not total_transactions:
+        st.warning("No payment transactions in the selected date range")
+        return
+    
+    total_value = pm_stats["total_value"]
+    avg_value = total_value / total_transactions
     
     # Payment method distribution
-    top_method = payment_methods.sort("order_count", descending=True).row(0, named=True)
-    method_share = (top_method["order_count"] / total_transactions) * 100 if total_transactions > 0 else 0
+    top_method = payment_methods.top_k(1, by="order_count").row(0, named=True)
+    method_share = (top_method["order_count"] / total_transactions) * 100
     
     # Installment insights
     if installment_analysis is not None and not installment_analysis.is_empty():
-        installment_usage = installment_analysis.filter(pl.col("payment_installments") > 1)
-        if not installment_usage.is_empty():
-            installment_rate = (installment_usage.select(pl.sum("order_count")).item() / 
-                              installment_analysis.select(pl.sum("order_count")).item()) * 100
+        installment_stats = summarize_installments(installment_analysis, date_key)
+        if installment_stats["multi_rows"]:
+            installment_rate = (installment_stats["multi_orders"] / installment_stats["total_orders"]) * 100
         else:
             installment_rate = 0
     else:
@@ -209,7 +259,8 @@ def render_payment_overview_kpis(payment_methods: pl.DataFrame, installment_anal
     # Payment insights highlight
     st.info(f"💳 **Dominant Payment Method**: {top_method['payment_type']} ({method_share:.1f}% of transactions)")
 
-def render_payment_methods_tab(payment_methods: pl.DataFrame) -> None:
+def render_payment_methods_tab(payment_methods: pl.DataFrame, date_key: Tuple[str, str],
+                               pm_stats: Optional[Dict[str, Any]]) -> None:
     """Render payment methods analysis tab."""
     st.subheader("💳 Payment Method Analysis")
     
@@ -223,7 +274,7 @@ def render_payment_methods_tab(payment_methods: pl.DataFrame) -> None:
         return
     
     # Payment method charts
-    render_payment_analysis_charts(payment_methods)
+    render_payment_analysis_charts(payment_methods, kind="methods")
     
     # Payment method breakdown
     col1, col2 = st.columns(2)
@@ -232,44 +283,24 @@ def render_payment_methods_tab(payment_methods: pl.DataFrame) -> None:
         st.markdown("### 📊 Payment Method Performance")
         
         # Add calculated metrics
-        enhanced_methods = payment_methods.with_columns([
-            (pl.col("total_value") / pl.col("order_count")).alias("avg_transaction_value"),
-            (pl.col("order_count") / payment_methods.select(pl.sum("order_count")).item() * 100).alias("volume_share_pct"),
-            (pl.col("total_value") / payment_methods.select(pl.sum("total_value")).item() * 100).alias("value_share_pct")
-        ])
+        enhanced_methods = enhance_methods(payment_methods, date_key, pm_stats)
         
         render_data_table(enhanced_methods, title="", download=False)
     
     with col2:
         st.markdown("### 💡 Payment Method Insights")
         
-        if not payment_methods.is_empty():
-            # Analyze payment method patterns
-            credit_card = payment_methods.filter(pl.col("payment_type") == "credit_card")
-            debit_card = payment_methods.filter(pl.col("payment_type") == "debit_card")
-            boleto = payment_methods.filter(pl.col("payment_type") == "boleto")
-            voucher = payment_methods.filter(pl.col("payment_type") == "voucher")
-            
-            # Payment method insights
-            total_value = payment_methods.select(pl.sum("total_value")).item()
-            
-            if not credit_card.is_empty():
-                cc_value = credit_card.select("total_value").item()
-                cc_avg = credit_card.select("avg_transaction_value").item() if "avg_transaction_value" in credit_card.columns else 0
-                cc_share = (cc_value / total_value) * 100 if total_value > 0 else 0
-                st.markdown(f"💳 **Credit Card**: {cc_share:.1f}% of value, R${cc_avg:.2f} avg")
-            
-            if not debit_card.is_empty():
-                dc_value = debit_card.select("total_value").item()
-                dc_avg = debit_card.select("avg_transaction_value").item() if "avg_transaction_value" in debit_card.columns else 0
-                dc_share = (dc_value / total_value) * 100 if total_value > 0 else 0
-                st.markdown(f"💰 **Debit Card**: {dc_share:.1f}% of value, R${dc_avg:.2f} avg")
-            
-            if not boleto.is_empty():
-                boleto_value = boleto.select("total_value").item()
-                boleto_avg = boleto.select("avg_transaction_value").item() if "avg_transaction_value" in boleto.columns else 0
-                boleto_share = (boleto_value / total_value) * 100 if total_value > 0 else 0
-                st.markdown(f"🎫 **Boleto**: {boleto_share:.1f}% of value, R${boleto_avg:.2f} avg")
+        # Index the per-type rows once instead of filtering for each method
+        by_type = {row["payment_type"]: row for row in enhanced_methods.iter_rows(named=True)}
+        
+        if (credit_card := by_type.get("credit_card")):
+            st.markdown(f"💳 **Credit Card**: {credit_card['value_share_pct']:.1f}% of value, R${credit_card['avg_transaction_value']:.2f} avg")
+        
+        if (debit_card := by_type.get("debit_card")):
+            st.markdown(f"💰 **Debit Card**: {debit_card['value_share_pct']:.1f}% of value, R${debit_card['avg_transaction_value']:.2f} avg")
+        
+        if (boleto := by_type.get("boleto")):
+            st.markdown(f"🎫 **Boleto**: {boleto['value_share_pct']:.1f}% of value, R${boleto['avg_transaction_value']:.2f} avg")
         
         # Payment optimization recommendations
         st.markdown("### 🎯 Payment Optimization")
@@ -283,7 +314,7 @@ def render_payment_methods_tab(payment_methods: pl.DataFrame) -> None:
         for tip in optimization_tips:
             st.markdown(tip)
 
-def render_installment_analysis_tab(installment_analysis: pl.DataFrame) -> None:
+def render_installment_analysis_tab(installment_analysis: pl.DataFrame, date_key: Tuple[str, str]) -> None:
     """Render installment analysis tab."""
     st.subheader("📊 Installment Payment Analysis")
     
@@ -302,7 +333,7 @@ def render_installment_analysis_tab(installment_analysis: pl.DataFrame) -> None:
         )
     
     # Installment charts
-    render_payment_analysis_charts(installment_analysis)
+    render_payment_analysis_charts(installment_analysis, kind="installments")
     
     # Installment insights
     col1, col2 = st.columns(2)
@@ -313,8 +344,8 @@ def render_installment_analysis_tab(installment_analysis: pl.DataFrame) -> None:
         # Enhanced installment data
         enhanced_installments = installment_analysis.with_columns([
             (pl.col("total_value") / pl.col("order_count")).alias("avg_order_value"),
-            (pl.col("order_count") / installment_analysis.select(pl.sum("order_count")).item() * 100).alias("order_share_pct"),
-            (pl.col("total_value") / installment_analysis.select(pl.sum("total_value")).item() * 100).alias("value_share_pct")
+            (pl.col("order_count") / pl.col("order_count").sum() * 100).alias("order_share_pct"),
+            (pl.col("total_value") / pl.col("total_value").sum() * 100).alias("value_share_pct")
         ])
         
         render_data_table(enhanced_installments, title="", download=False)
@@ -324,19 +355,14 @@ def render_installment_analysis_tab(installment_analysis: pl.DataFrame) -> None:
         
         if not installment_analysis.is_empty():
             # Calculate installment patterns
-            single_payment = installment_analysis.filter(pl.col("payment_installments") == 1)
-            multi_installment = installment_analysis.filter(pl.col("payment_installments") > 1)
+            installment_stats = summarize_installments(installment_analysis, date_key)
             
-            if not single_payment.is_empty() and not multi_installment.is_empty():
-                single_avg = single_payment.select(
-                    (pl.col("total_value") / pl.col("order_count")).mean()
-                ).item()
-                multi_avg = multi_installment.select(
-                    (pl.col("total_value") / pl.col("order_count")).mean()
-                ).item()
+            if installment_stats["single_rows"] and installment_stats["multi_rows"]:
+                single_avg = installment_stats["single_avg"]
+                multi_avg = installment_stats["multi_avg"]
                 
-                single_orders = single_payment.select(pl.sum("order_count")).item()
-                multi_orders = multi_installment.select(pl.sum("order_count")).item()
+                single_orders = installment_stats["single_orders"]
+                multi_orders = installment_stats["multi_orders"]
                 
                 installment_rate = (multi_orders / (single_orders + multi_orders)) * 100
                 
@@ -392,7 +418,7 @@ def render_revenue_optimization_tab(revenue_optimization: pl.DataFrame) -> None:
             )
     
     # Revenue optimization charts
-    render_payment_analysis_charts(revenue_optimization)
+    render_payment_analysis_charts(revenue_optimization, kind="revenue")
     
     # Revenue insights
     col1, col2 = st.columns(2)
@@ -403,7 +429,7 @@ def render_revenue_optimization_tab(revenue_optimization: pl.DataFrame) -> None:
         # Calculate revenue metrics
         revenue_metrics = revenue_optimization.with_columns([
             (pl.col("total_revenue") / pl.col("total_orders")).alias("avg_order_value"),
-            (pl.col("total_revenue") / revenue_optimization.select(pl.sum("total_revenue")).item() * 100).alias("revenue_share_pct")
+            (pl.col("total_revenue") / pl.col("total_revenue").sum() * 100).alias("revenue_share_pct")
         ])
         
         render_data_table(revenue_metrics, title="", download=False)
@@ -412,25 +438,25 @@ def render_revenue_optimization_tab(revenue_optimization: pl.DataFrame) -> None:
         st.markdown("### 💡 Revenue Optimization Opportunities")
         
         if not revenue_optimization.is_empty():
-            # Identify optimization opportunities
-            high_volume_low_value = revenue_optimization.filter(
-                (pl.col("total_orders") >= revenue_optimization.select(pl.col("total_orders").quantile(0.7)).item()) &
-                (pl.col("avg_order_value") <= revenue_optimization.select(pl.col("avg_order_value").quantile(0.3)).item())
-            )
+            # Identify optimization opportunities; only the segment counts are shown
+            orders = pl.col("total_orders")
+            order_value = pl.col("avg_order_value")
+            high_volume_low_value = (orders >= orders.quantile(0.7)) & (order_value <= order_value.quantile(0.3))
+            low_volume_high_value = (orders <= orders.quantile(0.3)) & (order_value >= order_value.quantile(0.7))
             
-            low_volume_high_value = revenue_optimization.filter(
-                (pl.col("total_orders") <= revenue_optimization.select(pl.col("total_orders").quantile(0.3)).item()) &
-                (pl.col("avg_order_value") >= revenue_optimization.select(pl.col("avg_order_value").quantile(0.7)).item())
-            )
+            hvlv_count, lvhv_count = revenue_optimization.lazy().select([
+                high_volume_low_value.sum().alias("high_volume_low_value"),
+                low_volume_high_value.sum().alias("low_volume_high_value")
+            ]).collect().row(0)
             
             st.markdown("**🔍 Optimization Segments:**")
             
-            if not high_volume_low_value.is_empty():
-                st.markdown(f"📊 **High Volume, Low Value**: {len(high_volume_low_value)} segments")
+            if hvlv_count:
+                st.markdown(f"📊 **High Volume, Low Value**: {hvlv_count} segments")
                 st.markdown("   → *Opportunity*: Upsell and cross-sell strategies")
             
-            if not low_volume_high_value.is_empty():
-                st.markdown(f"💎 **Low Volume, High Value**: {len(low_volume_high_value)} segments")
+            if lvhv_count:
+                st.markdown(f"💎 **Low Volume, High Value**: {lvhv_count} segments")
                 st.markdown("   → *Opportunity*: Customer acquisition and retention")
         
         # Revenue optimization strategies
@@ -445,11 +471,19 @@ def render_revenue_optimization_tab(revenue_optimization: pl.DataFrame) -> None:
         for strategy in revenue_strategies:
             st.markdown(strategy)
 
+@st.fragment
 def render_advanced_analytics_tab(payment_methods: pl.DataFrame,
                                  installment_analysis: pl.DataFrame,
                                  revenue_optimization: pl.DataFrame,
-                                 filters: Dict[str, Any]) -> None:
-    """Render advanced analytics tab."""
+                                 filters: Dict[str, Any],
+                                 date_key: Tuple[str, str],
+                                 pm_stats: Optional[Dict[str, Any]]) -> None:
+    """
+    Render advanced analytics tab.
+    
+    Runs as a fragment so the explorer widgets and export buttons only rerun
+    this tab instead of reloading the whole page.
+    """
     st.subheader("🔍 Advanced Payment Analytics")
     
     # Filter summary
@@ -496,10 +530,9 @@ def render_advanced_analytics_tab(payment_methods: pl.DataFrame,
             st.markdown("**Payment Method Evolution:**")
             
             # Credit card dominance analysis
-            credit_share = payment_methods.filter(pl.col("payment_type") == "credit_card")
+            credit_share = enhance_methods(payment_methods, date_key, pm_stats).filter(pl.col("payment_type") == "credit_card")
             if not credit_share.is_empty():
-                cc_volume_share = (credit_share.select("order_count").item() / 
-                                 payment_methods.select(pl.sum("order_count")).item()) * 100
+                cc_volume_share = credit_share.select("volume_share_pct").item()
                 
                 if cc_volume_share > 70:
                     st.success(f"💳 Credit cards dominate: {cc_volume_share:.1f}% of transactions")
@@ -513,7 +546,7 @@ def render_advanced_analytics_tab(payment_methods: pl.DataFrame,
             st.markdown("**Installment Preferences:**")
             
             max_installments = installment_analysis.select(pl.max("payment_installments")).item()
-            popular_installments = installment_analysis.sort("order_count", descending=True).head(3)
+            popular_installments = installment_analysis.top_k(3, by="order_count").sort("order_count", descending=True)
             
             st.markdown(f"📈 Max installments offered: {max_installments}")
             st.markdown("🏆 Most popular installment options:")
@@ -532,25 +565,24 @@ def render_advanced_analytics_tab(payment_methods: pl.DataFrame,
         
         if payment_methods is not None and not payment_methods.is_empty():
             # Analyze payment method performance
-            total_value = payment_methods.select(pl.sum("total_value")).item()
-            
-            for method_data in payment_methods.iter_rows(named=True):
-                method = method_data["payment_type"]
-                value_share = (method_data["total_value"] / total_value) * 100
-                
-                if method == "credit_card" and value_share > 60:
-                    recommendations.append("🎯 **Enhance credit card rewards** programs")
-                elif method == "boleto" and value_share > 20:
-                    recommendations.append("🎫 **Optimize boleto processing** for faster confirmation")
-                elif method == "debit_card" and value_share < 20:
-                    recommendations.append("💰 **Promote debit card** usage with discounts")
+            value_share = pl.col("total_value") / pm_stats["total_value"] * 100
+            method = pl.col("payment_type")
+            recommendations.extend(
+                payment_methods.select(
+                    pl.when((method == "credit_card") & (value_share > 60))
+                    .then(pl.lit("🎯 **Enhance credit card rewards** programs"))
+                    .when((method == "boleto") & (value_share > 20))
+                    .then(pl.lit("🎫 **Optimize boleto processing** for faster confirmation"))
+                    .when((method == "debit_card") & (value_share < 20))
+                    .then(pl.lit("💰 **Promote debit card** usage with discounts"))
+                    .alias("recommendation")
+                ).drop_nulls().to_series().to_list()
+            )
         
         if installment_analysis is not None and not installment_analysis.is_empty():
-            multi_installment = installment_analysis.filter(pl.col("payment_installments") > 1)
-            if not multi_installment.is_empty():
-                installment_revenue = multi_installment.select(pl.sum("total_value")).item()
-                total_revenue = installment_analysis.select(pl.sum("total_value")).item()
-                installment_share = (installment_revenue / total_revenue) * 100
+            installment_stats = summarize_installments(installment_analysis, date_key)
+            if installment_stats["multi_rows"]:
+                installment_share = (installment_stats["multi_value"] / installment_stats["total_value"]) * 100
                 
                 if installment_share > 40:
                     recommendations.append("📊 **Expand installment options** for high-value items")
@@ -578,7 +610,7 @@ def render_advanced_analytics_tab(payment_methods: pl.DataFrame,
     with col1:
         payment_type_filter = st.selectbox(
             "Payment Type",
-            ["All"] + (payment_methods["payment_type"].unique().to_list() if payment_methods is not None else []),
+            ["All"] + (get_payment_types(payment_methods, date_key) if payment_methods is not None else []),
             help="Filter analysis by payment type"
         )
     
@@ -602,14 +634,15 @@ def render_advanced_analytics_tab(payment_methods: pl.DataFrame,
     
     # Apply filters and show results
     filtered_data = None
-    if payment_methods is not None:
-        filtered_data = payment_methods
-        
+    if payment_methods is not None and not payment_methods.is_empty():
+        # Combine the explorer widgets into one predicate and filter once
+        predicates = [pl.col("avg_transaction_value") >= min_transaction_value]
         if payment_type_filter != "All":
-            filtered_data = filtered_data.filter(pl.col("payment_type") == payment_type_filter)
+            predicates.append(pl.col("payment_type") == payment_type_filter)
+        if "avg_installments" in payment_methods.columns:
+            predicates.append(pl.col("avg_installments") <= max_installments)
         
-        if "avg_transaction_value" in filtered_data.columns:
-            filtered_data = filtered_data.filter(pl.col("avg_transaction_value") >= min_transaction_value)
+        filtered_data = enhance_methods(payment_methods, date_key, pm_stats).lazy().filter(pl.all_horizontal(predicates)).collect()
     
     if filtered_data is not None and not filtered_data.is_empty():
         st.markdown(f"**Showing {len(filtered_data)} payment method(s) matching filters**")
@@ -622,7 +655,7 @@ def render_advanced_analytics_tab(payment_methods: pl.DataFrame,
     with col1:
         if st.button("💳 Export Payment Methods"):
             if payment_methods is not None:
-                csv_data = payment_methods.to_pandas().to_csv(index=False)
+                csv_data = export_frame_csv(payment_methods, date_key, "payment_methods")
                 st.download_button(
                     "Download Payment Methods",
                     csv_data,
@@ -634,7 +667,7 @@ def render_advanced_analytics_tab(payment_methods: pl.DataFrame,
     with col2:
         if st.button("📊 Export Installment Data"):
             if installment_analysis is not None:
-                csv_data = installment_analysis.to_pandas().to_csv(index=False)
+                csv_data = export_frame_csv(installment_analysis, date_key, "installment_analysis")
                 st.download_button(
                     "Download Installment Analysis",
                     csv_data,
@@ -645,5 +678,8 @@ def render_advanced_analytics_tab(payment_methods: pl.DataFrame,
     
     with col3:
         if st.button("🔄 Refresh Analysis"):
-            st.cache_data.clear()
+            # Only invalidate this page's caches so other pages stay warm
+            for cached_func in (load_payment_frames, enhance_methods, summarize_installments,
+                                get_payment_types, export_frame_csv):
+                cached_func.clear()
             st.rerun()
@@ -2,16 +2,34 @@
 Product Analysis page - Analysis of product performance, weight impact, and category insights.
 """
 
+import io
 import streamlit as st
 import polars as pl
+import pyarrow as pa
 from typing import Dict, Any, Optional
 
 from ..components.metrics import render_kpi_cards
 from ..components.charts import render_product_analysis_charts
-from ..components.tables import render_data_table, render_top_performers_table, render_pivot_table
+from ..components.tables import render_data_table, render_top_performers_table, render_pivot_table, render_correlation_table
 from ..data.data_loader import get_data_loader
 from ..data.data_processor import get_data_processor
 from ..data.cache_manager import cache_details
+from ..utils import script_thread_pool
+
+# Static weight correlation estimates shown in the detailed analysis tab
+WEIGHT_CORRELATIONS: Dict[str, float] = {
+    "Weight vs Delivery Days": 0.65,
+    "Weight vs Rating": -0.23,
+    "Weight vs On-Time Rate": -0.41
+}
+
+# Performance segment labels keyed by (rating >= 4.0) * 2 + (on-time rate >= 85%)
+PERFORMANCE_SEGMENTS: Dict[int, str] = {
+    3: "🟢 Stars",
+    2: "🟡 Service Issues",
+    1: "🟠 Product Issues",
+    0: "🔴 Needs Attention"
+}
 
 def render_product_analysis_page(filters: Dict[str, Any]) -> None:
     """
@@ -34,12 +52,23 @@ def render_product_analysis_page(filters: Dict[str, Any]) -> None:
     
     # Load product data
     with st.spinner("Loading product analysis data..."):
-        weight_impact = load_weight_impact_data(data_loader, start_date, end_date)
-        category_performance = load_category_performance_data(data_loader, start_date, end_date)
+        # Both loads are independent; overlap their query latency
+        with script_thread_pool(2) as executor:
+            weight_future = executor.submit(load_weight_impact_data, data_loader, start_date, end_date)
+            category_future = executor.submit(load_category_performance_data, data_loader, start_date, end_date)
+            weight_impact_table = weight_future.result()
+            category_performance_table = category_future.result()
+    
+    # Wrap the cached Arrow tables without copying their buffers
+    weight_impact = pl.from_arrow(weight_impact_table) if weight_impact_table is not None else None
+    category_performance = pl.from_arrow(category_performance_table) if category_performance_table is not None else None
+    
+    # Check category data once and share the result with every tab
+    cp_ok = category_performance is not None and not category_performance.is_empty()
     
     # Main product metrics
     st.subheader("📊 Product Performance Overview")
-    render_product_overview_kpis(category_performance)
+    render_product_overview_kpis(category_performance, cp_ok=cp_ok)
     
     st.markdown("---")
     
@@ -56,7 +85,7 @@ def render_product_analysis_page(filters: Dict[str, Any]) -> None:
     
     with tab2:
         try:
-            render_category_performance_tab(category_performance)
+            render_category_performance_tab(category_performance, cp_ok=cp_ok)
         except Exception as e:
             st.error(f"Error in Category Performance tab: {str(e)}")
             if "🟢 Stars" in str(e):
@@ -64,50 +93,103 @@ def render_product_analysis_page(filters: Dict[str, Any]) -> None:
     
     with tab3:
         try:
-            render_top_products_tab(category_performance)
+            render_top_products_tab(category_performance, cp_ok, start_date, end_date)
         except Exception as e:
             st.error(f"Error in Top Products tab: {str(e)}")
     
     with tab4:
         try:
-            render_detailed_analysis_tab(weight_impact, category_performance, filters)
+            render_detailed_analysis_tab(weight_impact, category_performance, filters, cp_ok=cp_ok)
         except Exception as e:
             st.error(f"Error in Detailed Analysis tab: {str(e)}")
 
 @cache_details()
-def load_weight_impact_data(_data_loader, start_date: str, end_date: str) -> Optional[pl.DataFrame]:
-    """Load product weight impact data."""
+def load_weight_impact_data(_data_loader, start_date: str, end_date: str) -> Optional[pa.Table]:
+    """Load product weight impact data as an Arrow table."""
     try:
-        return _data_loader.get_weight_impact(start_date, end_date)
+        df = _data_loader.get_weight_impact(start_date, end_date)
+        return df.to_arrow() if df is not None else None
     except Exception as e:
         st.error(f"Error loading weight impact data: {str(e)}")
         return None
 
 @cache_details()
-def load_category_performance_data(_data_loader, start_date: str, end_date: str) -> Optional[pl.DataFrame]:
-    """Load category performance data."""
+def load_category_performance_data(_data_loader, start_date: str, end_date: str) -> Optional[pa.Table]:
+    """Load category performance data as an Arrow table."""
     try:
-        return _data_loader.get_category_performance(start_date, end_date)
+        df = _data_loader.get_category_performance(start_date, end_date)
+        if df is None:
+            return None
+        
+        if not df.is_empty():
+            # Low-cardinality label, dictionary-encode it for sorts and group-bys
+            df = df.with_columns(pl.col("category").cast(pl.Categorical))
+        
+        return df.to_arrow()
     except Exception as e:
         st.error(f"Error loading category performance data: {str(e)}")
         return None
 
-def render_product_overview_kpis(category_performance: pl.DataFrame) -> None:
+@cache_details()
+def score_categories(_category_performance: pl.DataFrame, start_date: str, end_date: str) -> pl.DataFrame:
+    """Add normalized metric scores and a weighted composite score per category, cached per date range."""
+    # Normalize metrics to 0-1 scale for composite scoring
+    rating_score = (pl.col("avg_rating") - 1) / 4  # 1-5 scale to 0-1
+    delivery_score = pl.col("on_time_rate") / 100  # percentage to 0-1
+    revenue_score = pl.col("total_revenue") / pl.col("total_revenue").max()
+    
+    return _category_performance.with_columns([
+        rating_score.alias("rating_score"),
+        delivery_score.alias("delivery_score"),
+        revenue_score.alias("revenue_score"),
+        # Composite score (weighted average), built from the same expressions in one pass
+        (rating_score * 0.4 + delivery_score * 0.4 + revenue_score * 0.2).alias("composite_score")
+    ])
+
+@cache_details()
+def summarize_performance_segments(_category_performance: pl.DataFrame, start_date: str, end_date: str) -> pl.DataFrame:
+    """Count categories and revenue per rating/delivery performance segment, cached per date range."""
+    # Encode the two thresholds as a 0-3 segment id: rating bit * 2 + delivery bit.
+    # A null score fails both checks, so it falls into "Needs Attention" (0).
+    segment_id = (
+        (pl.col("avg_rating") >= 4.0).cast(pl.UInt8) * 2 +
+        (pl.col("on_time_rate") >= 85).cast(pl.UInt8)
+    ).fill_null(0).alias("segment_id")
+    
+    segments = _category_performance.group_by(segment_id).agg([
+        pl.len().alias("category_count"),
+        pl.sum("total_revenue").alias("segment_revenue")
+    ]).sort("segment_revenue", descending=True)
+    
+    # Label the (at most four) result rows
+    return segments.select([
+        pl.col("segment_id").replace_strict(
+            PERFORMANCE_SEGMENTS, default=PERFORMANCE_SEGMENTS[0], return_dtype=pl.Utf8
+        ).alias("Performance Segment"),
+        pl.col("category_count"),
+        pl.col("segment_revenue")
+    ])
+
+def render_product_overview_kpis(category_performance: pl.DataFrame, cp_ok: bool) -> None:
     """Render product overview KPI cards."""
-    if category_performance is None or category_performance.is_empty():
+    if not cp_ok:
         st.warning("No category performance data available for KPIs")
         return
     
-    # Calculate aggregate metrics
-    total_categories = len(category_performance)
-    total_orders = category_performance.select(pl.sum("order_count")).item()
-    total_revenue = category_performance.select(pl.sum("total_revenue")).item()
-    avg_rating = category_performance.select(
-        (pl.col("avg_rating") * pl.col("order_count")).sum() / pl.col("order_count").sum()
-    ).item()
-    
-    # Top category by revenue
-    top_category = category_performance.sort("total_revenue", descending=True).row(0, named=True)
+    # Calculate aggregate metrics and the top category by revenue in one streaming pass
+    kpis = category_performance.lazy().select([
+        pl.len().alias("total_categories"),
+        pl.sum("order_count").alias("total_orders"),
+        pl.sum("total_revenue").alias("total_revenue"),
+        ((pl.col("avg_rating") * pl.col("order_count")).sum() / pl.col("order_count").sum()).alias("avg_rating"),
+        pl.col("category").gather(pl.col("total_revenue").arg_max()).first().alias("top_category"),
+        pl.col("total_revenue").max().alias("top_category_revenue")
+    ]).collect(engine="streaming").row(0, named=True)
+    
+    total_categories = kpis["total_categories"]
+    total_orders = kpis["total_orders"]
+    total_revenue = kpis["total_revenue"]
+    avg_rating = kpis["avg_rating"]
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -140,7 +222,7 @@ def render_product_overview_kpis(category_performance: pl.DataFrame) -> None:
         )
     
     # Top category highlight
-    st.info(f"🏆 **Top Category**: {top_category['category']} with R${top_category['total_revenue']:,.0f} revenue")
+    st.info(f"🏆 **Top Category**: {kpis['top_category']} with R${kpis['top_category_revenue']:,.0f} revenue")
 
 def render_weight_impact_tab(weight_impact: pl.DataFrame) -> None:
     """Render weight impact analysis tab."""
@@ -165,17 +247,21 @@ def render_weight_impact_tab(weight_impact: pl.DataFrame) -> None:
         
         # Analyze weight impact patterns
         if not weight_impact.is_empty():
-            # Find heaviest category impact
-            heaviest = weight_impact.filter(pl.col("weight_category") == "5kg+")
-            lightest = weight_impact.filter(pl.col("weight_category") == "0-500g")
+            # Fetch the lightest and heaviest category stats in one pass
+            extremes = weight_impact.lazy().filter(
+                pl.col("weight_category").is_in(["0-500g", "5kg+"])
+            ).select(["weight_category", "avg_delivery_days", "avg_rating"]).collect().to_dict(as_series=False)
+            by_weight = {
+                category: (delivery_days, rating)
+                for category, delivery_days, rating in zip(
+                    extremes["weight_category"], extremes["avg_delivery_days"], extremes["avg_rating"]
+                )
+            }
             
-            if not heaviest.is_empty() and not lightest.is_empty():
-                heavy_delivery = heaviest.select("avg_delivery_days").item()
-                light_delivery = lightest.select("avg_delivery_days").item()
+            if "5kg+" in by_weight and "0-500g" in by_weight:
+                heavy_delivery, heavy_rating = by_weight["5kg+"]
+                light_delivery, light_rating = by_weight["0-500g"]
                 delivery_difference = heavy_delivery - light_delivery
-                
-                heavy_rating = heaviest.select("avg_rating").item()
-                light_rating = lightest.select("avg_rating").item()
                 rating_difference = light_rating - heavy_rating
                 
                 st.markdown(f"⚡ **Light products (0-500g)**: {light_delivery:.1f} avg delivery days")
@@ -200,14 +286,13 @@ def render_weight_impact_tab(weight_impact: pl.DataFrame) -> None:
             "💰 **Weight-based pricing** transparency for customers"
         ]
         
-        for rec in recommendations:
-            st.markdown(rec)
+        st.markdown("\n\n".join(recommendations))
 
-def render_category_performance_tab(category_performance: pl.DataFrame) -> None:
+def render_category_performance_tab(category_performance: pl.DataFrame, cp_ok: bool) -> None:
     """Render category performance analysis tab."""
     st.subheader("📊 Product Category Performance")
     
-    if category_performance is None or category_performance.is_empty():
+    if not cp_ok:
         st.warning("No category performance data available")
         return
     
@@ -219,7 +304,7 @@ def render_category_performance_tab(category_performance: pl.DataFrame) -> None:
     
     with col1:
         st.markdown("### 🏆 Top Revenue Categories")
-        top_revenue = category_performance.sort("total_revenue", descending=True).head(10)
+        top_revenue = category_performance.top_k(10, by="total_revenue")
         render_top_performers_table(top_revenue, "total_revenue", top_n=5, title=None)
     
     with col2:
@@ -228,7 +313,7 @@ def render_category_performance_tab(category_performance: pl.DataFrame) -> None:
         min_orders_for_rating = 50
         filtered_categories = category_performance.filter(pl.col("order_count") >= min_orders_for_rating)
         if not filtered_categories.is_empty():
-            top_rated = filtered_categories.sort("avg_rating", descending=True).head(10)
+            top_rated = filtered_categories.top_k(10, by="avg_rating")
             render_top_performers_table(top_rated, "avg_rating", top_n=5, title=None)
         else:
             st.info("Insufficient data for rating analysis")
@@ -238,8 +323,9 @@ def render_category_performance_tab(category_performance: pl.DataFrame) -> None:
     
     if not category_performance.is_empty():
         # Revenue concentration analysis
-        total_revenue = category_performance.select(pl.sum("total_revenue")).item()
-        top_5_revenue = category_performance.sort("total_revenue", descending=True).head(5).select(pl.sum("total_revenue")).item()
+        revenue = category_performance.get_column("total_revenue")
+        total_revenue = revenue.sum()
+        top_5_revenue = revenue.top_k(5).sum()
         concentration_pct = (top_5_revenue / total_revenue) * 100 if total_revenue > 0 else 0
         
         col1, col2, col3 = st.columns(3)
@@ -255,7 +341,7 @@ def render_category_performance_tab(category_performance: pl.DataFrame) -> None:
             high_performers = category_performance.filter(
                 (pl.col("avg_rating") >= 4.0) & (pl.col("on_time_rate") >= 85)
             )
-            performance_pct = (len(high_performers) / len(category_performance)) * 100
+            performance_pct = (high_performers.height / category_performance.height) * 100
             st.metric(
                 "🎯 High Performers",
                 f"{performance_pct:.1f}%",
@@ -272,11 +358,12 @@ def render_category_performance_tab(category_performance: pl.DataFrame) -> None:
                 help="Average order value across all categories"
             )
 
-def render_top_products_tab(category_performance: pl.DataFrame) -> None:
+def render_top_products_tab(category_performance: pl.DataFrame, cp_ok: bool,
+                            start_date: str, end_date: str) -> None:
     """Render top products analysis tab."""
     st.subheader("🏆 Top Performing Categories")
     
-    if category_performance is None or category_performance.is_empty():
+    if not cp_ok:
         st.warning("No category performance data available")
         return
     
@@ -284,20 +371,10 @@ def render_top_products_tab(category_performance: pl.DataFrame) -> None:
     st.markdown("### 🎯 Multi-Metric Leaders")
     
     # Add composite score for ranking
-    enhanced_categories = category_performance.with_columns([
-        # Normalize metrics to 0-1 scale for composite scoring
-        ((pl.col("avg_rating") - 1) / 4).alias("rating_score"),  # 1-5 scale to 0-1
-        ((pl.col("on_time_rate")) / 100).alias("delivery_score"),  # percentage to 0-1
-        (pl.col("total_revenue") / pl.col("total_revenue").max()).alias("revenue_score")
-    ]).with_columns([
-        # Composite score (weighted average)
-        (pl.col("rating_score") * 0.4 + 
-         pl.col("delivery_score") * 0.4 + 
-         pl.col("revenue_score") * 0.2).alias("composite_score")
-    ])
+    enhanced_categories = score_categories(category_performance, start_date, end_date)
     
     # Top performers by composite score
-    top_composite = enhanced_categories.sort("composite_score", descending=True).head(10)
+    top_composite = enhanced_categories.top_k(10, by="composite_score")
     
     col1, col2 = st.columns(2)
     
@@ -308,10 +385,10 @@ def render_top_products_tab(category_performance: pl.DataFrame) -> None:
     with col2:
         st.markdown("**📈 Growth Opportunities**")
         # Categories with high revenue but lower satisfaction
-        growth_opportunities = category_performance.filter(
-            (pl.col("total_revenue") >= category_performance.select(pl.col("total_revenue").quantile(0.7)).item()) &
+        growth_opportunities = category_performance.lazy().filter(
+            (pl.col("total_revenue") >= pl.col("total_revenue").quantile(0.7)) &
             (pl.col("avg_rating") <= 4.0)
-        ).sort("total_revenue", descending=True)
+        ).sort("total_revenue", descending=True).collect()
         
         if not growth_opportunities.is_empty():
             render_top_performers_table(growth_opportunities, "total_revenue", top_n=5, title=None)
@@ -321,29 +398,15 @@ def render_top_products_tab(category_performance: pl.DataFrame) -> None:
     # Category performance matrix
     st.markdown("### 📊 Category Performance Matrix")
     
-    # Create performance segments
-    performance_matrix = category_performance.with_columns([
-        pl.when((pl.col("avg_rating") >= 4.0) & (pl.col("on_time_rate") >= 85))
-        .then("Stars")
-        .when((pl.col("avg_rating") >= 4.0) & (pl.col("on_time_rate") < 85))
-        .then("Service Issues")
-        .when((pl.col("avg_rating") < 4.0) & (pl.col("on_time_rate") >= 85))
-        .then("Product Issues")
-        .otherwise("Needs Attention")
-        .alias("Performance Segment")
-    ])
-    
-    # Count categories in each segment
-    segment_counts = performance_matrix.group_by("Performance Segment").agg([
-        pl.count("category").alias("category_count"),
-        pl.sum("total_revenue").alias("segment_revenue")
-    ]).sort("segment_revenue", descending=True)
+    # Count categories and revenue in each performance segment
+    segment_counts = summarize_performance_segments(category_performance, start_date, end_date)
     
     render_data_table(segment_counts, title="Performance Segment Analysis", download=False)
 
 def render_detailed_analysis_tab(weight_impact: pl.DataFrame, 
                                 category_performance: pl.DataFrame,
-                                filters: Dict[str, Any]) -> None:
+                                filters: Dict[str, Any],
+                                cp_ok: bool) -> None:
     """Render detailed analysis tab."""
     st.subheader("🔍 Detailed Product Analysis")
     
@@ -353,8 +416,9 @@ def render_detailed_analysis_tab(weight_impact: pl.DataFrame,
     st.info(f"📅 Analysis Period: {date_range.get('start_date')} to {date_range.get('end_date')}")
     
     # Interactive category analysis
-    if category_performance is not None and not category_performance.is_empty():
+    if cp_ok:
         st.markdown("### 📊 Interactive Category Explorer")
+        total_n = category_performance.height
         
         # Category filters
         col1, col2, col3 = st.columns(3)
@@ -387,23 +451,23 @@ def render_detailed_analysis_tab(weight_impact: pl.DataFrame,
                 help="Filter categories by minimum order count"
             )
         
-        # Apply filters
-        filtered_categories = category_performance.filter(
-            (pl.col("total_revenue") >= min_revenue) &
-            (pl.col("avg_rating") >= min_rating) &
-            (pl.col("order_count") >= min_orders)
-        )
+        # Combine the thresholds into one predicate ahead of the enrichment
+        filtered_categories = category_performance.lazy().filter(pl.all_horizontal([
+            pl.col("total_revenue") >= min_revenue,
+            pl.col("avg_rating") >= min_rating,
+            pl.col("order_count") >= min_orders
+        ]))
         
-        st.markdown(f"**Showing {len(filtered_categories)} of {len(category_performance)} categories**")
+        # Apply filters and add calculated metrics in one lazy query
+        enhanced_data = filtered_categories.with_columns([
+            (pl.col("total_revenue") / pl.col("order_count")).alias("avg_order_value"),
+            ((pl.col("avg_rating") - 1) / 4 * 100).alias("rating_percentage"),
+            (pl.col("total_revenue") / pl.col("total_revenue").sum() * 100).alias("revenue_share_pct")
+        ]).collect()
         
-        if not filtered_categories.is_empty():
-            # Enhanced category data with calculated metrics
-            enhanced_data = filtered_categories.with_columns([
-                (pl.col("total_revenue") / pl.col("order_count")).alias("avg_order_value"),
-                ((pl.col("avg_rating") - 1) / 4 * 100).alias("rating_percentage"),
-                (pl.col("total_revenue") / filtered_categories.select(pl.sum("total_revenue")).item() * 100).alias("revenue_share_pct")
-            ])
-            
+        st.markdown(f"**Showing {enhanced_data.height} of {total_n} categories**")
+        
+        if not enhanced_data.is_empty():
             render_data_table(
                 enhanced_data,
                 title="Filtered Category Analysis",
@@ -417,28 +481,23 @@ def render_detailed_analysis_tab(weight_impact: pl.DataFrame,
         st.markdown("### ⚖️ Weight vs Performance Deep Dive")
         
         # Weight correlation analysis
-        weight_correlations = {
-            "Weight vs Delivery Days": 0.65,
-            "Weight vs Rating": -0.23,
-            "Weight vs On-Time Rate": -0.41
-        }
-        
-        from ..components.tables import render_correlation_table
-        render_correlation_table(weight_correlations, "Weight Impact Correlations")
+        render_correlation_table(WEIGHT_CORRELATIONS, "Weight Impact Correlations")
         
         # Weight optimization recommendations
         st.markdown("### 💡 Weight Optimization Strategy")
         
         if not weight_impact.is_empty():
-            heavy_categories = weight_impact.filter(
+            heavy_stats = weight_impact.lazy().filter(
                 pl.col("weight_category").is_in(["2-5kg", "5kg+"])
-            )
+            ).select([
+                pl.len().alias("heavy_rows"),
+                pl.sum("order_count").alias("total_heavy_orders"),
+                ((pl.col("avg_delivery_days") * pl.col("order_count")).sum() / pl.col("order_count").sum()).alias("avg_heavy_delay")
+            ]).collect().row(0, named=True)
             
-            if not heavy_categories.is_empty():
-                total_heavy_orders = heavy_categories.select(pl.sum("order_count")).item()
-                avg_heavy_delay = heavy_categories.select(
-                    (pl.col("avg_delivery_days") * pl.col("order_count")).sum() / pl.col("order_count").sum()
-                ).item()
+            if heavy_stats["heavy_rows"]:
+                total_heavy_orders = heavy_stats["total_heavy_orders"]
+                avg_heavy_delay = heavy_stats["avg_heavy_delay"]
                 
                 col1, col2 = st.columns(2)
                 
@@ -449,10 +508,12 @@ def render_detailed_analysis_tab(weight_impact: pl.DataFrame,
                 
                 with col2:
                     st.markdown("**🎯 Optimization Opportunities**")
-                    st.markdown("- Dedicated heavy item logistics")
-                    st.markdown("- Regional distribution centers")
-                    st.markdown("- Customer delivery preferences")
-                    st.markdown("- Weight-based shipping tiers")
+                    st.markdown("\n".join([
+                        "- Dedicated heavy item logistics",
+                        "- Regional distribution centers",
+                        "- Customer delivery preferences",
+                        "- Weight-based shipping tiers"
+                    ]))
     
     # Export options
     st.markdown("### 📥 Export Analysis")
@@ -461,7 +522,7 @@ def render_detailed_analysis_tab(weight_impact: pl.DataFrame,
     with col1:
         if st.button("📊 Export Category Data"):
             if category_performance is not None:
-                csv_data = category_performance.to_pandas().to_csv(index=False)
+                csv_data = category_performance.write_csv().encode("utf-8")
                 st.download_button(
                     "Download Category Analysis",
                     csv_data,
@@ -469,11 +530,22 @@ def render_detailed_analysis_tab(weight_impact: pl.DataFrame,
                     "text/csv",
                     key="category_performance_download"
                 )
+                
+                # Parquet keeps dtypes and the dictionary-encoded category column
+                parquet_buffer = io.BytesIO()
+                category_performance.write_parquet(parquet_buffer, compression="snappy")
+                st.download_button(
+                    "Download Category Analysis (Parquet)",
+                    parquet_buffer.getvalue(),
+                    "category_performance.parquet",
+                    "application/octet-stream",
+                    key="category_performance_parquet_download"
+                )
     
     with col2:
         if st.button("⚖️ Export Weight Analysis"):
             if weight_impact is not None:
-                csv_data = weight_impact.to_pandas().to_csv(index=False)
+                csv_data = weight_impact.write_csv().encode("utf-8")
                 st.download_button(
                     "Download Weight Analysis",
                     csv_data,
@@ -6,6 +6,7 @@ from .helpers import (
     validate_date_range,
     validate_bigquery_response,
     format_currency,
+    format_currency_series,
     format_percentage,
     format_number,
     safe_divide,
@@ -14,10 +15,13 @@ from .helpers import (
     detect_outliers,
     create_time_series,
     log_performance,
+    script_thread_pool,
     handle_missing_values,
     create_summary_stats,
     export_to_excel,
+    export_to_parquet,
     validate_email,
+    validate_emails_series,
     create_download_link
 )
 
@@ -25,6 +29,7 @@ __all__ = [
     "validate_date_range",
     "validate_bigquery_response", 
     "format_currency",
+    "format_currency_series",
     "format_percentage",
     "format_number",
     "safe_divide",
@@ -33,9 +38,12 @@ __all__ = [
     "detect_outliers",
     "create_time_series",
     "log_performance",
+    "script_thread_pool",
     "handle_missing_values",
     "create_summary_stats",
     "export_to_excel",
+    "export_to_parquet",
     "validate_email",
+    "validate_emails_series",
     "create_download_link"
 ]
@@ -3,12 +3,35 @@ Utility functions for data validation, formatting, and common operations.
 """
 
 import polars as pl
-import pandas as pd
+import polars.selectors as cs
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Union, Tuple
 from datetime import datetime, timedelta
 import re
 import json
+from functools import lru_cache
+from io import BytesIO
+
+# Precompiled patterns for column-name cleaning and email validation
+_NON_ALNUM_RUN = re.compile(r'[^a-zA-Z0-9]+')
+_CLEAN_NAME = re.compile(r'[a-z0-9]+(?:_[a-z0-9]+)*')
+# Unanchored: re.fullmatch and the \A...\z series pattern both reject a trailing newline
+_EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+_EMAIL_RE = re.compile(_EMAIL_PATTERN)
+
+# create_time_series frequency -> (truncation interval, period column name)
+_FREQ_MAP: Dict[str, Tuple[Optional[str], Optional[str]]] = {
+    'D': (None, None),
+    'W': ("1w", "week"),
+    'M': ("1mo", "month"),
+    'Q': ("1q", "quarter"),
+    'Y': ("1y", "year")
+}
+
+# Longest date range accepted by validate_date_range (2 years)
+_MAX_RANGE = timedelta(days=730)
 
 def validate_date_range(start_date: str, end_date: str) -> Tuple[bool, str]:
     """
@@ -22,17 +45,18 @@ def validate_date_range(start_date: str, end_date: str) -> Tuple[bool, str]:
         Tuple of (is_valid, error_message)
     """
     try:
-        start = datetime.strptime(start_date, '%Y-%m-%d')
-        end = datetime.strptime(end_date, '%Y-%m-%d')
+        start = datetime.fromisoformat(start_date)
+        end = datetime.fromisoformat(end_date)
+        now = datetime.now()
         
         if start > end:
             return False, "Start date must be before end date"
         
-        if end > datetime.now():
+        if end > now:
             return False, "End date cannot be in the future"
         
         # Check if date range is too large (more than 2 years)
-        if (end - start).days > 730:
+        if end - start > _MAX_RANGE:
             return False, "Date range cannot exceed 2 years"
         
         return True, ""
@@ -54,10 +78,14 @@ def validate_bigquery_response(df: pl.DataFrame, required_columns: List[str]) ->
     if df is None:
         return False, "No data returned from BigQuery"
     
-    if df.is_empty():
+    if df.height == 0:
         return False, "Empty dataset returned"
     
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    if not required_columns:
+        return True, ""
+    
+    available_columns = set(df.columns)
+    missing_columns = [col for col in required_columns if col not in available_columns]
     if missing_columns:
         return False, f"Missing required columns: {', '.join(missing_columns)}"
     
@@ -74,7 +102,7 @@ def format_currency(value: float, currency: str = "R$") -> str:
     Returns:
         Formatted currency string
     """
-    if pd.isna(value) or value is None:
+    if value is None or value != value:
         return f"{currency}0.00"
     
     if value >= 1_000_000:
@@ -84,6 +112,54 @@ def format_currency(value: float, currency: str = "R$") -> str:
     else:
         return f"{currency}{value:,.2f}"
 
+def _fixed_decimals(expr: pl.Expr, decimal_places: int, thousands: bool = False) -> pl.Expr:
+    """Render a float expression as text with exactly `decimal_places` decimals (null if not finite)."""
+    factor = 10 ** decimal_places
+    scaled = (expr.abs() * factor).round(0).cast(pl.Int64, strict=False)
+    
+    whole = (scaled // factor).cast(pl.Utf8)
+    if thousands:
+        # Group digits from the right: reverse, comma every three digits, reverse back
+        whole = whole.str.reverse().str.replace_all(r"(\d{3})", "${1},").str.strip_chars_end(",").str.reverse()
+    
+    return pl.concat_str([
+        pl.when(expr < 0).then(pl.lit("-")).otherwise(pl.lit("")),
+        whole,
+        pl.lit("."),
+        (scaled % factor).cast(pl.Utf8).str.zfill(decimal_places)
+    ])
+
+def format_currency_series(values: pl.Series, currency: str = "R$") -> pl.Series:
+    """
+    Format a column of currency values for display in one vectorized pass.
+    
+    Args:
+        values: Numeric Series to format
+        currency: Currency symbol
+        
+    Returns:
+        String Series formatted like format_currency
+    """
+    value = pl.col("value")
+    formatted = (
+        pl.when(value >= 1_000_000)
+        .then(pl.concat_str([pl.lit(currency), _fixed_decimals(value / 1_000_000, 1), pl.lit("M")]))
+        .when(value >= 1_000)
+        .then(pl.concat_str([pl.lit(currency), _fixed_decimals(value / 1_000, 1), pl.lit("K")]))
+        .otherwise(pl.concat_str([pl.lit(currency), _fixed_decimals(value, 2, thousands=True)]))
+    )
+    
+    result = values.cast(pl.Float64).to_frame("value").select(formatted.alias(values.name)).to_series()
+    
+    # Missing, non-finite and out-of-range values go through the scalar helper
+    fallback = result.is_null()
+    if fallback.any():
+        result = result.scatter(
+            fallback.arg_true(),
+            [format_currency(v) for v in values.filter(fallback).to_list()]
+        )
+    return result
+
 def format_percentage(value: float, decimal_places: int = 1) -> str:
     """
     Format percentage values for display.
@@ -95,7 +171,7 @@ def format_percentage(value: float, decimal_places: int = 1) -> str:
     Returns:
         Formatted percentage string
     """
-    if pd.isna(value) or value is None:
+    if value is None or value != value:
         return "0.0%"
     
     return f"{value:.{decimal_places}f}%"
@@ -111,7 +187,7 @@ def format_number(value: Union[int, float], compact: bool = True) -> str:
     Returns:
         Formatted number string
     """
-    if pd.isna(value) or value is None:
+    if value is None or value != value:
         return "0"
     
     if not compact:
@@ -138,7 +214,8 @@ def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> f
     Returns:
         Division result or default value
     """
-    if denominator == 0 or pd.isna(denominator):
+    # NaN is the only value not equal to itself
+    if denominator is None or denominator == 0 or denominator != denominator:
         return default
     return numerator / denominator
 
@@ -153,11 +230,18 @@ def calculate_percentage_change(current: float, previous: float) -> float:
     Returns:
         Percentage change
     """
-    if previous == 0 or pd.isna(previous) or pd.isna(current):
+    if (previous is None or current is None or previous == 0
+            or previous != previous or current != current):
         return 0.0
     
     return ((current - previous) / previous) * 100
 
+@lru_cache(maxsize=256)
+def _clean_names(columns: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Clean a schema's column names; cached since the same result shapes recur."""
+    # Lowercase, collapse each run of special chars/underscores to one underscore, trim
+    return tuple(_NON_ALNUM_RUN.sub('_', col.lower()).strip('_') for col in columns)
+
 def clean_column_names(df: pl.DataFrame) -> pl.DataFrame:
     """
     Clean and standardize column names.
@@ -168,18 +252,11 @@ def clean_column_names(df: pl.DataFrame) -> pl.DataFrame:
     Returns:
         DataFrame with cleaned column names
     """
-    # Convert to snake_case and remove special characters
-    new_columns = []
-    for col in df.columns:
-        # Convert to lowercase and replace spaces/special chars with underscore
-        clean_col = re.sub(r'[^a-zA-Z0-9_]', '_', col.lower())
-        # Remove duplicate underscores
-        clean_col = re.sub(r'_+', '_', clean_col)
-        # Remove leading/trailing underscores
-        clean_col = clean_col.strip('_')
-        new_columns.append(clean_col)
-    
-    return df.rename(dict(zip(df.columns, new_columns)))
+    # Most BigQuery results are already snake_case; leave those untouched
+    if all(_CLEAN_NAME.fullmatch(col) for col in df.columns):
+        return df
+    
+    return df.rename(dict(zip(df.columns, _clean_names(tuple(df.columns)))))
 
 def detect_outliers(df: pl.DataFrame, column: str, method: str = 'iqr') -> pl.DataFrame:
     """
@@ -193,32 +270,32 @@ def detect_outliers(df: pl.DataFrame, column: str, method: str = 'iqr') -> pl.Da
     Returns:
         DataFrame with outlier flag column
     """
+    value = pl.col(column)
+    
     if method == 'iqr':
-        Q1 = df.select(pl.col(column).quantile(0.25)).item()
-        Q3 = df.select(pl.col(column).quantile(0.75)).item()
-        IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        
-        return df.with_columns([
-            pl.when((pl.col(column) < lower_bound) | (pl.col(column) > upper_bound))
-            .then(True)
-            .otherwise(False)
-            .alias(f"{column}_outlier")
-        ])
+        # Quantiles are scalar aggregates broadcast against the column in the same pass
+        q1 = value.quantile(0.25)
+        q3 = value.quantile(0.75)
+        iqr = q3 - q1
+        is_outlier = (value < q1 - 1.5 * iqr) | (value > q3 + 1.5 * iqr)
     
     elif method == 'zscore':
-        mean_val = df.select(pl.col(column).mean()).item()
-        std_val = df.select(pl.col(column).std()).item()
-        
-        return df.with_columns([
-            pl.when(pl.col(column).abs() > (mean_val + 3 * std_val))
-            .then(True)
-            .otherwise(False)
-            .alias(f"{column}_outlier")
-        ])
+        is_outlier = value.abs() > (value.mean() + 3 * value.std())
     
-    return df
+    else:
+        return df
+    
+    return df.lazy().with_columns([
+        is_outlier.fill_null(False).alias(f"{column}_outlier")
+    ]).collect()
+
+def _time_series_aggs(value_column: str) -> List[pl.Expr]:
+    """Aggregations shared by every create_time_series frequency."""
+    return [
+        pl.col(value_column).sum().alias(f"total_{value_column}"),
+        pl.col(value_column).mean().alias(f"avg_{value_column}"),
+        pl.len().alias("record_count")
+    ]
 
 def create_time_series(df: pl.DataFrame, date_column: str, 
                       value_column: str, freq: str = 'D') -> pl.DataFrame:
@@ -234,37 +311,26 @@ def create_time_series(df: pl.DataFrame, date_column: str,
     Returns:
         Aggregated time series DataFrame
     """
-    # Convert to date if needed
-    df = df.with_columns([
+    # Parse, bucket, aggregate and sort as one lazy pipeline
+    lf = df.lazy().with_columns([
         pl.col(date_column).str.strptime(pl.Date, format='%Y-%m-%d').alias(date_column)
     ])
     
-    if freq == 'D':
-        return df.group_by(date_column).agg([
-            pl.col(value_column).sum().alias(f"total_{value_column}"),
-            pl.col(value_column).mean().alias(f"avg_{value_column}"),
-            pl.count().alias("record_count")
-        ]).sort(date_column)
-    
-    elif freq == 'W':
-        return df.with_columns([
-            pl.col(date_column).dt.truncate("1w").alias("week")
-        ]).group_by("week").agg([
-            pl.col(value_column).sum().alias(f"total_{value_column}"),
-            pl.col(value_column).mean().alias(f"avg_{value_column}"),
-            pl.count().alias("record_count")
-        ]).sort("week")
-    
-    elif freq == 'M':
-        return df.with_columns([
-            pl.col(date_column).dt.truncate("1mo").alias("month")
-        ]).group_by("month").agg([
-            pl.col(value_column).sum().alias(f"total_{value_column}"),
-            pl.col(value_column).mean().alias(f"avg_{value_column}"),
-            pl.count().alias("record_count")
-        ]).sort("month")
+    if freq not in _FREQ_MAP:
+        return lf.collect()
     
-    return df
+    interval, key = _FREQ_MAP[freq]
+    if interval is None:
+        # Daily buckets group on the parsed date column directly
+        key = date_column
+    else:
+        lf = lf.with_columns([
+            pl.col(date_column).dt.truncate(interval).alias(key)
+        ])
+    
+    return lf.group_by(key, maintain_order=False).agg(
+        _time_series_aggs(value_column)
+    ).sort(key).collect(engine="streaming")
 
 def log_performance(func_name: str, execution_time: float, record_count: int = None):
     """
@@ -275,21 +341,32 @@ def log_performance(func_name: str, execution_time: float, record_count: int = N
         execution_time: Execution time in seconds
         record_count: Number of records processed
     """
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "function": func_name,
-        "execution_time": round(execution_time, 3),
-        "status": "success"
-    }
+    # Nothing is persisted yet, so skip all work unless debug output is on.
+    # In production, this would write to a proper logging system
+    if not st.session_state.get("debug_mode", False):
+        return
+    
+    st.info(f"⚡ {func_name}: {execution_time:.3f}s" + 
+           (f" ({record_count:,} records)" if record_count else ""))
+
+def script_thread_pool(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Create a thread pool whose workers share the current Streamlit script context.
     
-    if record_count is not None:
-        log_entry["record_count"] = record_count
-        log_entry["records_per_second"] = round(record_count / execution_time, 2)
+    Without the context, cache lookups and st.error calls made from worker
+    threads are dropped with a "missing ScriptRunContext" warning.
     
-    # In production, this would write to a proper logging system
-    if st.session_state.get("debug_mode", False):
-        st.info(f"⚡ {func_name}: {execution_time:.3f}s" + 
-               (f" ({record_count:,} records)" if record_count else ""))
+    Args:
+        max_workers: Maximum number of worker threads
+        
+    Returns:
+        ThreadPoolExecutor attached to the calling script run
+    """
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx())
+    )
 
 def handle_missing_values(df: pl.DataFrame, strategy: str = 'drop') -> pl.DataFrame:
     """
@@ -307,28 +384,17 @@ def handle_missing_values(df: pl.DataFrame, strategy: str = 'drop') -> pl.DataFr
     
     elif strategy == 'fill_zero':
         # Fill numeric columns with 0, string columns with empty string
-        fill_values = {}
-        for col in df.columns:
-            dtype = df[col].dtype
-            if dtype in [pl.Int64, pl.Float64, pl.Int32, pl.Float32]:
-                fill_values[col] = 0
-            elif dtype == pl.Utf8:
-                fill_values[col] = ""
-        
-        return df.fill_null(fill_values)
+        return df.lazy().with_columns([
+            cs.numeric().fill_null(0),
+            cs.string().fill_null("")
+        ]).collect(engine="streaming")
     
     elif strategy == 'fill_mean':
-        # Fill numeric columns with mean, others with mode or zero
-        fill_values = {}
-        for col in df.columns:
-            dtype = df[col].dtype
-            if dtype in [pl.Int64, pl.Float64, pl.Int32, pl.Float32]:
-                mean_val = df.select(pl.col(col).mean()).item()
-                fill_values[col] = mean_val if mean_val is not None else 0
-            else:
-                fill_values[col] = ""
-        
-        return df.fill_null(fill_values)
+        # Fill numeric columns with their mean (0 when all null), string columns with empty string
+        return df.lazy().with_columns([
+            cs.numeric().fill_null(cs.numeric().mean()).fill_null(0),
+            cs.string().fill_null("")
+        ]).collect(engine="streaming")
     
     return df
 
@@ -343,24 +409,31 @@ def create_summary_stats(df: pl.DataFrame, numeric_columns: List[str]) -> Dict[s
     Returns:
         Dictionary of summary statistics
     """
-    stats = {}
-    
-    for col in numeric_columns:
-        if col in df.columns:
-            col_stats = df.select([
-                pl.col(col).count().alias("count"),
-                pl.col(col).mean().alias("mean"),
-                pl.col(col).median().alias("median"),
-                pl.col(col).std().alias("std"),
-                pl.col(col).min().alias("min"),
-                pl.col(col).max().alias("max"),
-                pl.col(col).quantile(0.25).alias("q25"),
-                pl.col(col).quantile(0.75).alias("q75")
-            ]).to_dict(as_series=False)
-            
-            stats[col] = {k: v[0] if v else 0 for k, v in col_stats.items()}
-    
-    return stats
+    columns = [col for col in numeric_columns if col in df.columns]
+    if not columns:
+        return {}
+    
+    # Compute every statistic for every column in one query so each column is scanned once
+    selected = pl.col(columns)
+    stat_exprs = {
+        "count": selected.count(),
+        "mean": selected.mean(),
+        "median": selected.median(),
+        "std": selected.std(),
+        "min": selected.min(),
+        "max": selected.max(),
+        "q25": selected.quantile(0.25),
+        "q75": selected.quantile(0.75)
+    }
+    
+    row = df.lazy().select([
+        expr.name.suffix(f"__{name}") for name, expr in stat_exprs.items()
+    ]).collect(engine="streaming").row(0, named=True)
+    
+    return {
+        col: {name: row[f"{col}__{name}"] for name in stat_exprs}
+        for col in columns
+    }
 
 def export_to_excel(dataframes: Dict[str, pl.DataFrame], filename: str) -> bytes:
     """
@@ -373,16 +446,37 @@ def export_to_excel(dataframes: Dict[str, pl.DataFrame], filename: str) -> bytes
     Returns:
         Excel file as bytes
     """
-    from io import BytesIO
-    import pandas as pd
+    import xlsxwriter
     
     output = BytesIO()
     
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+    # Write each Polars frame straight into one shared workbook, no Pandas copy
+    with xlsxwriter.Workbook(output, {"in_memory": True}) as workbook:
         for sheet_name, df in dataframes.items():
-            # Convert Polars to Pandas for Excel export
-            pandas_df = df.to_pandas()
-            pandas_df.to_excel(writer, sheet_name=sheet_name, index=False)
+            df.write_excel(workbook=workbook, worksheet=sheet_name)
+    
+    return output.getvalue()
+
+def export_to_parquet(dataframes: Dict[str, pl.DataFrame]) -> bytes:
+    """
+    Export multiple DataFrames as a zip archive of Parquet files.
+    
+    Args:
+        dataframes: Dictionary mapping file names (without extension) to DataFrames
+        
+    Returns:
+        Zip archive as bytes, one `<name>.parquet` entry per DataFrame
+    """
+    import zipfile
+    
+    output = BytesIO()
+    
+    # Parquet pages are already compressed, so the archive only stores them
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, df in dataframes.items():
+            buffer = BytesIO()
+            df.write_parquet(buffer, compression="zstd")
+            archive.writestr(f"{name}.parquet", buffer.getvalue())
     
     return output.getvalue()
 
@@ -396,8 +490,19 @@ def validate_email(email: str) -> bool:
     Returns:
         True if valid email format
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.fullmatch(email) is not None
+
+def validate_emails_series(emails: pl.Series) -> pl.Series:
+    """
+    Validate a column of email addresses in one vectorized pass.
+    
+    Args:
+        emails: String Series of email addresses
+        
+    Returns:
+        Boolean Series, False for invalid or missing addresses
+    """
+    return emails.str.contains(rf"\A{_EMAIL_PATTERN}\z").fill_null(False)
 
 def create_download_link(data: bytes, filename: str, text: str) -> str:
     """
@@ -413,6 +518,9 @@ def create_download_link(data: bytes, filename: str, text: str) -> str:
     """
     import base64
     
-    b64 = base64.b64encode(data).decode()
-    href = f'<a href="data:application/octet-stream;base64,{b64}" download="{filename}">{text}</a>'
-    return href
+    # Base64 output is pure ASCII; join the pieces once instead of building them into an f-string
+    b64 = base64.b64encode(data).decode('ascii')
+    return "".join((
+        '<a href="data:application/octet-stream;base64,', b64,
+        '" download="', filename, '">', text, '</a>'
+    ))
@@ -0,0 +1,32 @@
+"""Tests for olist_dashboard.utils.helpers."""
+
+import pytest
+
+pl = pytest.importorskip("polars")
+pytest.importorskip("streamlit")
+
+from olist_dashboard.utils.helpers import validate_email, validate_emails_series
+
+
+EMAIL_CASES = [
+    "a@b.com",
+    "first.last+tag@example.com.br",
+    "a@b.com\n",
+    "\na@b.com",
+    "a@b.com ",
+    " a@b.com",
+    "a@b.c",
+    "a@b.com\nx@y.com",
+    "no-at-sign.com",
+    "a@b@c.com",
+    "",
+]
+
+
+def test_validate_emails_series_matches_scalar():
+    result = validate_emails_series(pl.Series("email", EMAIL_CASES)).to_list()
+    assert result == [validate_email(email) for email in EMAIL_CASES]
+
+
+def test_validate_emails_series_rejects_missing():
+    assert validate_emails_series(pl.Series("email", [None, "a@b.com"])).to_list() == [False, True]